@@ -1,66 +1,380 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
+import numpy as np
 from datetime import datetime, date
-import json
+import msgspec
+import orjson
 import os
+import struct
+import tempfile
 
 # Set page config
 st.set_page_config(page_title="Bodybuilding Tracker", page_icon="💪", layout="wide")
 
 # Data file paths
-WEIGHT_FILE = "weight_data.json"
-WORKOUT_FILE = "workout_data.json"
-PROFILE_FILE = "profile_data.json"
+WEIGHT_FILE = "weight_data.msgpack"
+WORKOUT_FILE = "workout_data.msgpack"
+PROFILE_FILE = "profile_data.msgpack"
+
+# Pre-msgpack JSON stores, migrated on first run
+LEGACY_WEIGHT_FILE = "weight_data.json"
+LEGACY_WORKOUT_FILE = "workout_data.json"
+LEGACY_PROFILE_FILE = "profile_data.json"
+
+# Dates are stored as YYYY-MM-DD strings and parsed once per cached load
+DATE_FORMAT = '%Y-%m-%d'
+
+# Weight and workout logs are a sequence of length-prefixed msgpack frames,
+# so logging an entry appends one frame instead of rewriting the whole file
+FRAME_HEADER = struct.Struct('>I')
+# A log entry encodes to a few hundred bytes; a header declaring more than this is corrupt.
+# It also keeps the first byte of every frame log at 0x00, unlike a bare msgpack array.
+MAX_FRAME_SIZE = 64 * 1024
+
+class Profile(msgspec.Struct):
+    name: str = ""
+    age: int = 36
+    weight: float = 83.25
+    height: int = 173
+    goal_weight: float = 95.0
+    experience: str = "Beginner"
+
+# Full rewrites go to a temp file and are renamed into place, so a crash mid-write
+# leaves the previous file intact instead of a truncated one. Each write gets its own
+# temp file so concurrent sessions never write into the same one.
+def write_atomic(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def write_msgpack(path, obj):
+    write_atomic(path, msgspec.msgpack.encode(obj))
+
+def encode_frame(record):
+    payload = msgspec.msgpack.encode(record)
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+def append_frame(path, record):
+    with open(path, 'ab') as f:
+        f.write(encode_frame(record))
+
+def write_frames(path, records):
+    write_atomic(path, b''.join(encode_frame(record) for record in records))
+
+# Returns the decoded records, the byte offset where the last complete frame ends,
+# and the file size seen by this same read
+def read_frames(path):
+    with open(path, 'rb') as f:
+        buf = memoryview(f.read())
+    records = []
+    offset = 0
+    while offset + FRAME_HEADER.size <= len(buf):
+        (size,) = FRAME_HEADER.unpack_from(buf, offset)
+        if size > MAX_FRAME_SIZE:
+            raise ValueError(f"{path} is corrupt: frame at byte {offset} declares {size} bytes")
+        start = offset + FRAME_HEADER.size
+        # A short trailing frame means an append was interrupted; stop before it
+        if start + size > len(buf):
+            break
+        records.append(msgspec.msgpack.decode(buf[start:start + size]))
+        offset = start + size
+    return records, offset, len(buf)
+
+# Cut off a torn trailing frame so the next append starts on a frame boundary.
+# Only the tail of an interrupted append is cut; anything else is refused.
+def read_log(path):
+    records, end, size = read_frames(path)
+    if end < size:
+        if end == 0:
+            raise ValueError(f"{path} has no complete frames; refusing to truncate it")
+        with open(path, 'r+b') as f:
+            # Leave the file alone if another session appended since it was read
+            if f.seek(0, os.SEEK_END) == size:
+                f.truncate(end)
+    return records
+
+# Logs written before the frame format were a single msgpack array
+def migrate_msgpack_array(path):
+    with open(path, 'rb') as f:
+        if f.read(1) in (b'', b'\x00'):
+            return
+        f.seek(0)
+        records = msgspec.msgpack.decode(f.read())
+    if not isinstance(records, list):
+        raise ValueError(f"{path} is neither a frame log nor a msgpack array")
+    write_frames(path, records)
+
+# Compact in-memory dtypes; these ranges are bounded by the input widgets.
+# Workout text columns are Arrow-backed so exercise filters run as Arrow kernels.
+WEIGHT_DTYPES = {'weight': 'float32'}
+WORKOUT_DTYPES = {
+    'exercise': 'string[pyarrow]', 'notes': 'string[pyarrow]',
+    'sets': 'int8', 'reps': 'int8', 'rpe': 'int8', 'weight': 'float32', 'volume': 'float32'
+}
+
+def downcast(df, dtypes):
+    return df.astype({col: dtype for col, dtype in dtypes.items() if col in df.columns}, errors='ignore')
+
+# E1RM and next-weight rules as ufuncs, so whole columns can be rebuilt in one call.
+# Signatures are given up front so they compile eagerly, and cache_resource keeps
+# the compiled ufuncs across reruns instead of recompiling on every script run.
+# numba is imported and the ufuncs compiled on first use, not on every cold start.
+@st.cache_resource(show_spinner=False)
+def progression_ufuncs():
+    import numba
+
+    @numba.vectorize(['float32(float32, int8)', 'float64(float64, float64)'])
+    def estimate_1rm(weight, reps):
+        return weight * (1 + reps / 30.0)
+
+    @numba.vectorize(['float32(float32, int8)', 'float64(float64, float64)'])
+    def suggest_next_weight(weight, rpe):
+        if rpe <= 8:
+            return weight * 1.025
+        elif rpe == 9:
+            return weight
+        else:
+            return weight * 0.95
+
+    return estimate_1rm, suggest_next_weight
+
+# Fill derived values for rows from older logs in one vectorized pass per column.
+# A log mixing old and new entries has the column with NaN in the old rows only.
+# Rounding happens in float64 so the float32 results don't carry noise into the column.
+def derive_workout_columns(df):
+    if df.empty:
+        return df
+    for col in ('e1rm', 'next_weight', 'volume'):
+        if col not in df.columns:
+            df[col] = np.nan
+    weight, reps = df['weight'].values, df['reps'].values
+    e1rm_mask, next_mask = df['e1rm'].isna().values, df['next_weight'].isna().values
+    # Logs whose rows all carry these columns never need numba
+    if e1rm_mask.any() or next_mask.any():
+        estimate_1rm, suggest_next_weight = progression_ufuncs()
+        if e1rm_mask.any():
+            df.loc[e1rm_mask, 'e1rm'] = np.round(estimate_1rm(weight[e1rm_mask], reps[e1rm_mask]).astype('float64'), 1)
+        if next_mask.any():
+            df.loc[next_mask, 'next_weight'] = np.round(suggest_next_weight(weight[next_mask], df['rpe'].values[next_mask]).astype('float64'), 1)
+    mask = df['volume'].isna().values
+    if mask.any():
+        df.loc[mask, 'volume'] = weight[mask] * reps[mask] * df['sets'].values[mask]
+    return downcast(df, {'volume': WORKOUT_DTYPES['volume']})
+
+# Loaded frames are always in ascending date order, so newest-first views are just df.iloc[::-1]
+def sort_by_date(df):
+    if df['date'].is_monotonic_increasing:
+        return df
+    return df.sort_values('date', kind='stable', ignore_index=True)
+
+def read_legacy_json(path):
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
 
 # Initialize data files if they don't exist
 def init_data_files():
     if not os.path.exists(WEIGHT_FILE):
-        with open(WEIGHT_FILE, 'w') as f:
-            json.dump([], f)
+        records = read_legacy_json(LEGACY_WEIGHT_FILE) if os.path.exists(LEGACY_WEIGHT_FILE) else []
+        write_frames(WEIGHT_FILE, records)
+    else:
+        migrate_msgpack_array(WEIGHT_FILE)
     if not os.path.exists(WORKOUT_FILE):
-        with open(WORKOUT_FILE, 'w') as f:
-            json.dump([], f)
+        records = read_legacy_json(LEGACY_WORKOUT_FILE) if os.path.exists(LEGACY_WORKOUT_FILE) else []
+        write_frames(WORKOUT_FILE, records)
+    else:
+        migrate_msgpack_array(WORKOUT_FILE)
     if not os.path.exists(PROFILE_FILE):
-        with open(PROFILE_FILE, 'w') as f:
-            json.dump({
-                "name": "",
-                "age": 36,
-                "weight": 83.25,
-                "height": 173,
-                "goal_weight": 95,
-                "experience": "Beginner"
-            }, f)
+        if os.path.exists(LEGACY_PROFILE_FILE):
+            write_msgpack(PROFILE_FILE, read_legacy_json(LEGACY_PROFILE_FILE))
+        else:
+            write_msgpack(PROFILE_FILE, Profile())
 
 init_data_files()
 
 # Load data functions
-def load_weight_data():
-    with open(WEIGHT_FILE, 'r') as f:
-        data = json.load(f)
-    return pd.DataFrame(data) if data else pd.DataFrame(columns=['date', 'weight', 'notes'])
+# Cached per (path, mtime) so reruns skip disk reads until the file changes
+@st.cache_data(show_spinner=False)
+def load_weight_data(path, mtime):
+    data = read_log(path)
+    df = pd.DataFrame(data) if data else pd.DataFrame(columns=['date', 'weight', 'notes'])
+    df['date'] = pd.to_datetime(df['date'], format=DATE_FORMAT, cache=True)
+    return downcast(sort_by_date(df), WEIGHT_DTYPES)
+
+@st.cache_data(show_spinner=False)
+def load_workout_data(path, mtime):
+    data = read_log(path)
+    df = pd.DataFrame(data) if data else pd.DataFrame(columns=['date', 'exercise', 'sets', 'reps', 'weight', 'rpe', 'notes'])
+    df['date'] = pd.to_datetime(df['date'], format=DATE_FORMAT, cache=True)
+    return derive_workout_columns(downcast(sort_by_date(df), WORKOUT_DTYPES))
+
+@st.cache_data(show_spinner=False)
+def load_profile(path, mtime):
+    # Decoding straight into Profile validates types and fills in missing fields
+    with open(path, 'rb') as f:
+        return msgspec.msgpack.decode(f.read(), type=Profile)
+
+# Derived views are keyed on row count and last date; _df itself is not hashed
+@st.cache_data(show_spinner=False)
+def weekly_volume(_df, n_rows, last_date):
+    weeks = _df['date'].dt.to_period('W').astype(str)
+    return _df.groupby(weeks)['volume'].sum().rename_axis('week').reset_index()
+
+@st.cache_data(show_spinner=False)
+def exercise_names(_df, n_rows, last_date):
+    return tuple(_df['exercise'].unique())
+
+# Row positions per exercise, so a chart is one take() instead of a full-column compare
+@st.cache_data(show_spinner=False)
+def exercise_index(_df, n_rows, last_date):
+    return dict(_df.groupby('exercise').indices)
+
+# Figure objects are cached as shared resources, keyed on the size and last point of the
+# plotted rows; st.plotly_chart only reads them, and renders a Figure far faster than JSON.
+# Streamlit itself imports plotly.io at startup; only a cache miss pays for building and
+# validating a figure, and only the weekly volume chart imports plotly.express.
+def figure_key(df):
+    return len(df), df['date'].iat[-1], float(df['weight'].iat[-1])
+
+@st.cache_resource(show_spinner=False)
+def weight_trend_figure(_df, key, goal_weight):
+    import plotly.graph_objects as go
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=_df['date'],
+        y=_df['weight'],
+        mode='lines+markers',
+        name='Weight',
+        line=dict(color='#4CAF50', width=3)
+    ))
+    fig.add_hline(y=goal_weight, line_dash="dash", line_color="red", annotation_text="Goal")
+    fig.update_layout(height=300, xaxis_title="Date", yaxis_title="Weight (kg)")
+    return fig
 
-def load_workout_data():
-    with open(WORKOUT_FILE, 'r') as f:
-        data = json.load(f)
-    return pd.DataFrame(data) if data else pd.DataFrame(columns=['date', 'exercise', 'sets', 'reps', 'weight', 'rpe', 'notes'])
+@st.cache_resource(show_spinner=False)
+def weight_progress_figure(_df, key, goal_weight):
+    import plotly.graph_objects as go
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=_df['date'],
+        y=_df['weight'],
+        mode='lines+markers',
+        name='Weight',
+        line=dict(color='#2196F3', width=3),
+        marker=dict(size=8)
+    ))
+    
+    fig.add_hline(y=goal_weight, line_dash="dash", line_color="red", 
+                 annotation_text=f"Goal: {goal_weight} kg")
+    
+    fig.update_layout(
+        height=400,
+        xaxis_title="Date",
+        yaxis_title="Weight (kg)",
+        hovermode='x unified'
+    )
+    return fig
 
-def load_profile():
-    with open(PROFILE_FILE, 'r') as f:
-        return json.load(f)
+@st.cache_resource(show_spinner=False)
+def exercise_progress_figure(_df, exercise, key):
+    import plotly.graph_objects as go
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=_df['date'],
+        y=_df['weight'],
+        mode='lines+markers',
+        name='Weight',
+        line=dict(color='#FF5722', width=3),
+        marker=dict(size=8)
+    ))
+    
+    fig.update_layout(
+        height=400,
+        xaxis_title="Date",
+        yaxis_title="Weight (kg)",
+        hovermode='x unified'
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def weekly_volume_figure(_volume_by_week, n_rows, last_date):
+    import plotly.express as px
+    
+    fig = px.bar(_volume_by_week, x='week', y='volume', 
+                labels={'week': 'Week', 'volume': 'Total Volume (kg)'},
+                color_discrete_sequence=['#4CAF50'])
+    fig.update_layout(height=400)
+    return fig
+
+def clear_weight_caches():
+    load_weight_data.clear()
+    weight_trend_figure.clear()
+    weight_progress_figure.clear()
+
+def clear_workout_caches():
+    load_workout_data.clear()
+    weekly_volume.clear()
+    exercise_names.clear()
+    exercise_index.clear()
+    exercise_progress_figure.clear()
+    weekly_volume_figure.clear()
+
+# Logs are already in date order, so place the entry by binary search instead of re-sorting
+def insert_by_date(df, entry):
+    row = pd.DataFrame([entry])
+    row = row.astype({col: dtype for col, dtype in df.dtypes.items() if col in row.columns})
+    pos = int(np.searchsorted(df['date'].values, row['date'].values[0], side='right'))
+    return pd.concat([df.iloc[:pos], row, df.iloc[pos:]], ignore_index=True)
+
+# Go through the shortest float32 repr so 84.1 leaves the app as 84.1, not 84.09999847
+def widen_float32(df):
+    float32_cols = df.select_dtypes('float32').columns
+    if len(float32_cols):
+        df = df.astype({col: str for col in float32_cols}).astype({col: 'float64' for col in float32_cols})
+    return df
+
+# Dates are parsed on load but always stored as YYYY-MM-DD strings
+def to_records(df):
+    df = widen_float32(df.assign(date=df['date'].dt.strftime(DATE_FORMAT)))
+    return df.to_dict('records')
 
 def save_weight_data(df):
-    with open(WEIGHT_FILE, 'w') as f:
-        json.dump(df.to_dict('records'), f)
+    write_frames(WEIGHT_FILE, to_records(df))
+    clear_weight_caches()
+
+def append_weight_entry(entry):
+    append_frame(WEIGHT_FILE, entry)
+    clear_weight_caches()
 
 def save_workout_data(df):
-    with open(WORKOUT_FILE, 'w') as f:
-        json.dump(df.to_dict('records'), f)
+    write_frames(WORKOUT_FILE, to_records(df))
+    clear_workout_caches()
+
+def append_workout_entry(entry):
+    append_frame(WORKOUT_FILE, entry)
+    clear_workout_caches()
 
 def save_profile(profile):
-    with open(PROFILE_FILE, 'w') as f:
-        json.dump(profile, f)
+    write_msgpack(PROFILE_FILE, profile)
+    load_profile.clear()
+
+# Exercise library
+EXERCISES = (
+    "Barbell Squat", "Deadlift", "Bench Press", "Overhead Press", "Barbell Row",
+    "Incline Dumbbell Press", "Dumbbell Row", "Lat Pulldown", "Pull-ups",
+    "Barbell Curl", "Tricep Pushdown", "Romanian Deadlift", "Leg Press",
+    "Bulgarian Split Squat", "Face Pulls", "Dips", "Leg Curl", "Calf Raise",
+    "Hammer Curl", "Overhead Tricep Extension"
+)
 
 # Sidebar navigation
 st.sidebar.title("💪 Navigation")
@@ -75,9 +389,9 @@ page = st.sidebar.radio("Go to:", [
 ])
 
 # Load data
-weight_df = load_weight_data()
-workout_df = load_workout_data()
-profile = load_profile()
+weight_df = load_weight_data(WEIGHT_FILE, os.path.getmtime(WEIGHT_FILE))
+workout_df = load_workout_data(WORKOUT_FILE, os.path.getmtime(WORKOUT_FILE))
+profile = load_profile(PROFILE_FILE, os.path.getmtime(PROFILE_FILE))
 
 # ===== DASHBOARD PAGE =====
 if page == "📊 Dashboard":
@@ -87,13 +401,13 @@ if page == "📊 Dashboard":
     
     with col1:
         if not weight_df.empty:
-            current_weight = weight_df.iloc[-1]['weight']
-            st.metric("Current Weight", f"{current_weight} kg")
+            current_weight = weight_df['weight'].iat[-1]
+            st.metric("Current Weight", f"{current_weight!s} kg")
         else:
             st.metric("Current Weight", "No data")
     
     with col2:
-        goal_weight = profile.get('goal_weight', 95)
+        goal_weight = profile.goal_weight
         st.metric("Goal Weight", f"{goal_weight} kg")
     
     with col3:
@@ -105,7 +419,8 @@ if page == "📊 Dashboard":
     
     with col4:
         if not workout_df.empty:
-            workouts_this_week = len(workout_df[pd.to_datetime(workout_df['date']) >= pd.Timestamp.now() - pd.Timedelta(days=7)])
+            week_start = np.datetime64(pd.Timestamp.now() - pd.Timedelta(days=7))
+            workouts_this_week = int((workout_df['date'].values >= week_start).sum())
             st.metric("Workouts This Week", workouts_this_week)
         else:
             st.metric("Workouts This Week", 0)
@@ -117,16 +432,7 @@ if page == "📊 Dashboard":
     with col1:
         st.subheader("📈 Recent Weight Trend")
         if not weight_df.empty and len(weight_df) > 1:
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=pd.to_datetime(weight_df['date']),
-                y=weight_df['weight'],
-                mode='lines+markers',
-                name='Weight',
-                line=dict(color='#4CAF50', width=3)
-            ))
-            fig.add_hline(y=goal_weight, line_dash="dash", line_color="red", annotation_text="Goal")
-            fig.update_layout(height=300, xaxis_title="Date", yaxis_title="Weight (kg)")
+            fig = weight_trend_figure(weight_df, figure_key(weight_df), goal_weight)
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("Log at least 2 weight entries to see trend")
@@ -134,8 +440,9 @@ if page == "📊 Dashboard":
     with col2:
         st.subheader("🏋️ Recent Workouts")
         if not workout_df.empty:
-            recent = workout_df.tail(5)[['date', 'exercise', 'weight', 'rpe']].sort_values('date', ascending=False)
-            st.dataframe(recent, hide_index=True, use_container_width=True)
+            recent = workout_df.iloc[-5:][::-1][['date', 'exercise', 'weight', 'rpe']]
+            st.dataframe(recent, hide_index=True, use_container_width=True,
+                         column_config={'date': st.column_config.DateColumn()})
         else:
             st.info("No workouts logged yet")
 
@@ -156,27 +463,30 @@ elif page == "⚖️ Log Weight":
             submitted = st.form_submit_button("💾 Save Weight", use_container_width=True)
             
             if submitted:
-                new_entry = pd.DataFrame([{
-                    'date': weight_date.strftime('%Y-%m-%d'),
+                new_entry = {
+                    'date': weight_date.strftime(DATE_FORMAT),
                     'weight': weight_value,
                     'notes': notes
-                }])
-                weight_df = pd.concat([weight_df, new_entry], ignore_index=True)
-                weight_df = weight_df.sort_values('date')
-                save_weight_data(weight_df)
+                }
+                # The log is kept in date order, so only back-dated entries need a rewrite
+                if weight_df.empty or pd.Timestamp(weight_date) >= weight_df['date'].iat[-1]:
+                    append_weight_entry(new_entry)
+                else:
+                    save_weight_data(insert_by_date(weight_df, new_entry))
                 st.success("✅ Weight logged successfully!")
                 st.rerun()
     
     with col2:
         st.subheader("Quick Stats")
         if not weight_df.empty:
-            latest = weight_df.iloc[-1]
-            st.metric("Latest Weight", f"{latest['weight']} kg")
-            st.metric("Date", latest['date'])
+            # str() of the float32 scalar gives its shortest repr (84.1, not 84.0999984741211)
+            latest_weight = weight_df['weight'].iat[-1]
+            st.metric("Latest Weight", f"{latest_weight!s} kg")
+            st.metric("Date", weight_df['date'].iat[-1].strftime(DATE_FORMAT))
             
             if len(weight_df) > 1:
-                prev_weight = weight_df.iloc[-2]['weight']
-                change = latest['weight'] - prev_weight
+                prev_weight = weight_df['weight'].iat[-2]
+                change = latest_weight - prev_weight
                 st.metric("Change from Last", f"{change:+.1f} kg")
         else:
             st.info("No weight data yet")
@@ -185,19 +495,28 @@ elif page == "⚖️ Log Weight":
     
     st.subheader("📋 Weight History")
     if not weight_df.empty:
-        display_df = weight_df.copy()
-        display_df = display_df.sort_values('date', ascending=False)
+        display_df = weight_df.iloc[::-1]
         
-        # Add delete buttons
-        for idx, row in display_df.iterrows():
-            col1, col2, col3, col4 = st.columns([2, 2, 4, 1])
-            col1.write(row['date'])
-            col2.write(f"{row['weight']} kg")
-            col3.write(row['notes'] if row['notes'] else "-")
-            if col4.button("🗑️", key=f"del_weight_{idx}"):
-                weight_df = weight_df.drop(idx)
-                save_weight_data(weight_df)
-                st.rerun()
+        # One editor for the whole history; select rows and press Delete to remove them
+        st.caption("Entries can only be deleted here: select rows and press Delete. Rows added with + are not saved; log new weights above.")
+        st.data_editor(
+            display_df,
+            key='weights',
+            num_rows='dynamic',
+            disabled=['date', 'weight', 'notes'],
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                'date': st.column_config.DateColumn(),
+                'weight': st.column_config.NumberColumn(format="%.2f kg")
+            }
+        )
+        deleted_rows = st.session_state['weights']['deleted_rows']
+        if deleted_rows:
+            weight_df = weight_df.drop(display_df.index[deleted_rows])
+            save_weight_data(weight_df)
+            del st.session_state['weights']
+            st.rerun()
     else:
         st.info("No weight entries yet. Add your first one above!")
 
@@ -205,15 +524,6 @@ elif page == "⚖️ Log Weight":
 elif page == "🏋️ Log Workout":
     st.title("🏋️ Log Your Workout")
     
-    # Exercise library
-    exercises = [
-        "Barbell Squat", "Deadlift", "Bench Press", "Overhead Press", "Barbell Row",
-        "Incline Dumbbell Press", "Dumbbell Row", "Lat Pulldown", "Pull-ups",
-        "Barbell Curl", "Tricep Pushdown", "Romanian Deadlift", "Leg Press",
-        "Bulgarian Split Squat", "Face Pulls", "Dips", "Leg Curl", "Calf Raise",
-        "Hammer Curl", "Overhead Tricep Extension"
-    ]
-    
     col1, col2 = st.columns([2, 1])
     
     with col1:
@@ -221,7 +531,7 @@ elif page == "🏋️ Log Workout":
         
         with st.form("workout_form"):
             workout_date = st.date_input("Date", value=date.today())
-            exercise = st.selectbox("Exercise", exercises)
+            exercise = st.selectbox("Exercise", EXERCISES)
             
             col_a, col_b = st.columns(2)
             with col_a:
@@ -237,16 +547,12 @@ elif page == "🏋️ Log Workout":
             
             if submitted:
                 # Calculate E1RM and suggested next weight
-                e1rm = weight * (1 + reps / 30)
-                if rpe <= 8:
-                    next_weight = weight * 1.025
-                elif rpe == 9:
-                    next_weight = weight
-                else:
-                    next_weight = weight * 0.95
+                estimate_1rm, suggest_next_weight = progression_ufuncs()
+                e1rm = float(estimate_1rm(weight, reps))
+                next_weight = float(suggest_next_weight(weight, rpe))
                 
-                new_entry = pd.DataFrame([{
-                    'date': workout_date.strftime('%Y-%m-%d'),
+                new_entry = {
+                    'date': workout_date.strftime(DATE_FORMAT),
                     'exercise': exercise,
                     'sets': sets,
                     'reps': reps,
@@ -256,10 +562,11 @@ elif page == "🏋️ Log Workout":
                     'next_weight': round(next_weight, 1),
                     'volume': sets * reps * weight,
                     'notes': notes
-                }])
-                workout_df = pd.concat([workout_df, new_entry], ignore_index=True)
-                workout_df = workout_df.sort_values('date')
-                save_workout_data(workout_df)
+                }
+                if workout_df.empty or pd.Timestamp(workout_date) >= workout_df['date'].iat[-1]:
+                    append_workout_entry(new_entry)
+                else:
+                    save_workout_data(insert_by_date(workout_df, new_entry))
                 st.success(f"✅ Exercise logged! Next session: {next_weight:.1f} kg")
                 st.rerun()
     
@@ -272,8 +579,8 @@ elif page == "🏋️ Log Workout":
         st.markdown("---")
         
         st.subheader("Today's Progress")
-        today = date.today().strftime('%Y-%m-%d')
-        today_workouts = workout_df[workout_df['date'] == today]
+        today = np.datetime64(date.today())
+        today_workouts = workout_df[workout_df['date'].values == today]
         if not today_workouts.empty:
             st.metric("Exercises Today", len(today_workouts))
             total_volume = today_workouts['volume'].sum()
@@ -285,9 +592,10 @@ elif page == "🏋️ Log Workout":
     
     st.subheader("📋 Recent Workouts")
     if not workout_df.empty:
-        recent = workout_df.tail(10).sort_values('date', ascending=False)
+        recent = workout_df.iloc[-10:][::-1]
         display_cols = ['date', 'exercise', 'sets', 'reps', 'weight', 'rpe', 'next_weight']
-        st.dataframe(recent[display_cols], hide_index=True, use_container_width=True)
+        st.dataframe(recent[display_cols], hide_index=True, use_container_width=True,
+                     column_config={'date': st.column_config.DateColumn()})
     else:
         st.info("No workouts logged yet. Add your first one above!")
 
@@ -348,71 +656,38 @@ elif page == "📈 Progress Charts":
     with tab1:
         st.subheader("Weight Over Time")
         if not weight_df.empty and len(weight_df) > 1:
-            fig = go.Figure()
-            
-            weight_df_sorted = weight_df.sort_values('date')
-            
-            fig.add_trace(go.Scatter(
-                x=pd.to_datetime(weight_df_sorted['date']),
-                y=weight_df_sorted['weight'],
-                mode='lines+markers',
-                name='Weight',
-                line=dict(color='#2196F3', width=3),
-                marker=dict(size=8)
-            ))
-            
-            goal_weight = profile.get('goal_weight', 95)
-            fig.add_hline(y=goal_weight, line_dash="dash", line_color="red", 
-                         annotation_text=f"Goal: {goal_weight} kg")
-            
-            fig.update_layout(
-                height=400,
-                xaxis_title="Date",
-                yaxis_title="Weight (kg)",
-                hovermode='x unified'
-            )
+            goal_weight = profile.goal_weight
+            fig = weight_progress_figure(weight_df, figure_key(weight_df), goal_weight)
             st.plotly_chart(fig, use_container_width=True)
             
             # Stats
             col1, col2, col3 = st.columns(3)
-            total_change = weight_df_sorted.iloc[-1]['weight'] - weight_df_sorted.iloc[0]['weight']
+            starting_weight = weight_df['weight'].iat[0]
+            latest_weight = weight_df['weight'].iat[-1]
+            total_change = latest_weight - starting_weight
             col1.metric("Total Change", f"{total_change:+.1f} kg")
-            col2.metric("Starting Weight", f"{weight_df_sorted.iloc[0]['weight']} kg")
-            col3.metric("Current Weight", f"{weight_df_sorted.iloc[-1]['weight']} kg")
+            col2.metric("Starting Weight", f"{starting_weight!s} kg")
+            col3.metric("Current Weight", f"{latest_weight!s} kg")
         else:
             st.info("Log at least 2 weight entries to see progress")
     
     with tab2:
         st.subheader("Lifting Progress by Exercise")
         if not workout_df.empty:
-            exercise_select = st.selectbox("Select Exercise", workout_df['exercise'].unique())
+            n_rows, last_date = len(workout_df), workout_df['date'].iat[-1]
+            logged_exercises = exercise_names(workout_df, n_rows, last_date)
+            exercise_select = st.selectbox("Select Exercise", logged_exercises)
             
-            exercise_data = workout_df[workout_df['exercise'] == exercise_select].sort_values('date')
+            exercise_data = workout_df.take(exercise_index(workout_df, n_rows, last_date)[exercise_select])
             
             if len(exercise_data) > 1:
-                fig = go.Figure()
-                
-                fig.add_trace(go.Scatter(
-                    x=pd.to_datetime(exercise_data['date']),
-                    y=exercise_data['weight'],
-                    mode='lines+markers',
-                    name='Weight',
-                    line=dict(color='#FF5722', width=3),
-                    marker=dict(size=8)
-                ))
-                
-                fig.update_layout(
-                    height=400,
-                    xaxis_title="Date",
-                    yaxis_title="Weight (kg)",
-                    hovermode='x unified'
-                )
+                fig = exercise_progress_figure(exercise_data, exercise_select, figure_key(exercise_data))
                 st.plotly_chart(fig, use_container_width=True)
                 
                 # Progress stats
                 col1, col2, col3 = st.columns(3)
-                weight_increase = exercise_data.iloc[-1]['weight'] - exercise_data.iloc[0]['weight']
-                pct_increase = (weight_increase / exercise_data.iloc[0]['weight']) * 100
+                weight_increase = exercise_data['weight'].iat[-1] - exercise_data['weight'].iat[0]
+                pct_increase = (weight_increase / exercise_data['weight'].iat[0]) * 100
                 col1.metric("Weight Increase", f"{weight_increase:+.1f} kg")
                 col2.metric("% Increase", f"{pct_increase:+.1f}%")
                 col3.metric("Sessions", len(exercise_data))
@@ -425,19 +700,13 @@ elif page == "📈 Progress Charts":
         st.subheader("Training Volume Over Time")
         if not workout_df.empty:
             # Calculate weekly volume
-            workout_df_copy = workout_df.copy()
-            workout_df_copy['date'] = pd.to_datetime(workout_df_copy['date'])
-            workout_df_copy['week'] = workout_df_copy['date'].dt.to_period('W').astype(str)
-            
-            weekly_volume = workout_df_copy.groupby('week')['volume'].sum().reset_index()
+            n_rows, last_date = len(workout_df), workout_df['date'].iat[-1]
+            volume_by_week = weekly_volume(workout_df, n_rows, last_date)
             
-            fig = px.bar(weekly_volume, x='week', y='volume', 
-                        labels={'week': 'Week', 'volume': 'Total Volume (kg)'},
-                        color_discrete_sequence=['#4CAF50'])
-            fig.update_layout(height=400)
+            fig = weekly_volume_figure(volume_by_week, n_rows, last_date)
             st.plotly_chart(fig, use_container_width=True)
             
-            st.metric("Average Weekly Volume", f"{weekly_volume['volume'].mean():,.0f} kg")
+            st.metric("Average Weekly Volume", f"{volume_by_week['volume'].mean():,.0f} kg")
         else:
             st.info("No workout data yet")
 
@@ -446,39 +715,42 @@ elif page == "👤 Profile":
     st.title("👤 Your Profile")
     
     with st.form("profile_form"):
-        name = st.text_input("Name", value=profile.get('name', ''))
-        age = st.number_input("Age", min_value=15, max_value=100, value=profile.get('age', 36))
+        name = st.text_input("Name", value=profile.name)
+        age = st.number_input("Age", min_value=15, max_value=100, value=profile.age)
         
         col1, col2 = st.columns(2)
         with col1:
             weight = st.number_input("Starting Weight (kg)", min_value=40.0, max_value=200.0, 
-                                    value=float(profile.get('weight', 83.25)), step=0.1)
+                                    value=profile.weight, step=0.1)
             height = st.number_input("Height (cm)", min_value=100, max_value=250, 
-                                    value=profile.get('height', 173))
+                                    value=profile.height)
         with col2:
             goal_weight = st.number_input("Goal Weight (kg)", min_value=40.0, max_value=200.0, 
-                                         value=float(profile.get('goal_weight', 95.0)), step=0.1)
+                                         value=profile.goal_weight, step=0.1)
             experience = st.selectbox("Experience Level", 
                                      ["Beginner", "Intermediate", "Advanced"],
-                                     index=["Beginner", "Intermediate", "Advanced"].index(profile.get('experience', 'Beginner')))
+                                     index=["Beginner", "Intermediate", "Advanced"].index(profile.experience))
         
         submitted = st.form_submit_button("💾 Save Profile", use_container_width=True)
         
         if submitted:
-            profile = {
-                'name': name,
-                'age': age,
-                'weight': weight,
-                'height': height,
-                'goal_weight': goal_weight,
-                'experience': experience
-            }
+            profile = Profile(
+                name=name,
+                age=age,
+                weight=weight,
+                height=height,
+                goal_weight=goal_weight,
+                experience=experience
+            )
             save_profile(profile)
             st.success("✅ Profile updated successfully!")
             st.rerun()
 
 # ===== EXPORT DATA PAGE =====
 elif page == "💾 Export Data":
+    import io
+    import zipfile
+    
     st.title("💾 Export Your Data")
     
     st.info("Export your data to Excel or ODS format for backup or external analysis")
@@ -488,47 +760,44 @@ elif page == "💾 Export Data":
     with col1:
         st.subheader("Export to Excel")
         if st.button("📥 Download Excel File (.xlsx)", use_container_width=True):
-            # Create Excel file
-            with pd.ExcelWriter('bodybuilding_data.xlsx', engine='openpyxl') as writer:
+            # Create Excel file in memory
+            buffer = io.BytesIO()
+            with pd.ExcelWriter(buffer, engine='xlsxwriter',
+                                datetime_format='YYYY-MM-DD') as writer:
                 if not weight_df.empty:
-                    weight_df.to_excel(writer, sheet_name='Weight Log', index=False)
+                    widen_float32(weight_df).to_excel(writer, sheet_name='Weight Log', index=False)
                 if not workout_df.empty:
-                    workout_df.to_excel(writer, sheet_name='Workout Log', index=False)
+                    widen_float32(workout_df).to_excel(writer, sheet_name='Workout Log', index=False)
                 
                 # Profile sheet
-                profile_df = pd.DataFrame([profile])
+                profile_df = pd.DataFrame([msgspec.structs.asdict(profile)])
                 profile_df.to_excel(writer, sheet_name='Profile', index=False)
             
-            with open('bodybuilding_data.xlsx', 'rb') as f:
-                st.download_button(
-                    label="⬇️ Click to Download",
-                    data=f,
-                    file_name=f'bodybuilding_data_{datetime.now().strftime("%Y%m%d")}.xlsx',
-                    mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                    use_container_width=True
-                )
+            st.download_button(
+                label="⬇️ Click to Download",
+                data=buffer.getvalue(),
+                file_name=f'bodybuilding_data_{datetime.now().strftime("%Y%m%d")}.xlsx',
+                mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                use_container_width=True
+            )
     
     with col2:
         st.subheader("Export to CSV")
         if st.button("📥 Download CSV Files (.zip)", use_container_width=True):
-            import zipfile
-            
-            with zipfile.ZipFile('bodybuilding_data.zip', 'w') as zipf:
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
                 if not weight_df.empty:
-                    weight_df.to_csv('weight_log.csv', index=False)
-                    zipf.write('weight_log.csv')
+                    zipf.writestr('weight_log.csv', weight_df.to_csv(index=False))
                 if not workout_df.empty:
-                    workout_df.to_csv('workout_log.csv', index=False)
-                    zipf.write('workout_log.csv')
+                    zipf.writestr('workout_log.csv', workout_df.to_csv(index=False))
             
-            with open('bodybuilding_data.zip', 'rb') as f:
-                st.download_button(
-                    label="⬇️ Click to Download",
-                    data=f,
-                    file_name=f'bodybuilding_data_{datetime.now().strftime("%Y%m%d")}.zip',
-                    mime='application/zip',
-                    use_container_width=True
-                )
+            st.download_button(
+                label="⬇️ Click to Download",
+                data=buffer.getvalue(),
+                file_name=f'bodybuilding_data_{datetime.now().strftime("%Y%m%d")}.zip',
+                mime='application/zip',
+                use_container_width=True
+            )
     
     st.markdown("---")
     
@@ -536,7 +805,10 @@ elif page == "💾 Export Data":
     col1, col2, col3 = st.columns(3)
     col1.metric("Weight Entries", len(weight_df))
     col2.metric("Workout Entries", len(workout_df))
-    col3.metric("Unique Exercises", len(workout_df['exercise'].unique()) if not workout_df.empty else 0)
+    if not workout_df.empty:
+        col3.metric("Unique Exercises", len(exercise_names(workout_df, len(workout_df), workout_df['date'].iat[-1])))
+    else:
+        col3.metric("Unique Exercises", 0)
 
 # Footer
 st.sidebar.markdown("---")